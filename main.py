@@ -9,6 +9,9 @@ import random
 import json
 import os
 import html
+import secrets
+import threading
+from collections import OrderedDict
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -90,6 +93,50 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+# Puzzles handed out by /api/generate, keyed by a short token so the client
+# can submit answers without sending the solution back. Bounded so abandoned
+# puzzles don't pile up; the oldest entries are evicted first.
+PUZZLE_CACHE_SIZE = int(os.getenv("PUZZLE_CACHE_SIZE", "1000"))
+issued_puzzles: "OrderedDict[str, dict]" = OrderedDict()
+issued_puzzles_lock = threading.Lock()
+
+def register_puzzle(puzzle: dict) -> str:
+    token = secrets.token_urlsafe(8)
+    with issued_puzzles_lock:
+        issued_puzzles[token] = {"grid": puzzle.get('grid'), "words": puzzle.get('words')}
+        while len(issued_puzzles) > PUZZLE_CACHE_SIZE:
+            issued_puzzles.popitem(last=False)
+    return token
+
+def claim_puzzle(token: str) -> Optional[dict]:
+    with issued_puzzles_lock:
+        return issued_puzzles.pop(token, None)
+
+def score_grid(solution_grid, user_grid):
+    score = 0
+    total_letters = 0
+    correct_letters = 0
+    
+    # Calculate score
+    # Assuming grids are same size 20x20
+    for r in range(len(solution_grid)):
+        for c in range(len(solution_grid[0])):
+            if solution_grid[r][c]: # If this cell is part of a word
+                total_letters += 1
+                # Check if user input matches (case insensitive)
+                if (r < len(user_grid) and c < len(user_grid[0]) and 
+                    user_grid[r][c] and 
+                    user_grid[r][c].upper() == solution_grid[r][c].upper()):
+                    correct_letters += 1
+                    score += 10 # 10 points per correct letter
+    
+    return {
+        "score": score,
+        "correct_letters": correct_letters,
+        "total_letters": total_letters,
+        "percentage": int((correct_letters / total_letters) * 100) if total_letters > 0 else 0
+    }
+
 # Static & Templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -110,6 +157,7 @@ def generate_game(request: Request, session: Session = Depends(get_session)):
     
     generator = CrosswordGenerator(width=20, height=20)
     puzzle = generator.generate(selected_stars)
+    puzzle['token'] = register_puzzle(puzzle)
     
     return puzzle
 
@@ -160,40 +208,46 @@ def submit_game(request: Request, game_id: int, req: SubmitRequest, session: Ses
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    solution_grid = json.loads(game.grid_data)
-    user_grid = req.user_grid
-    
-    score = 0
-    total_letters = 0
-    correct_letters = 0
-    
-    # Calculate score
-    # Assuming grids are same size 20x20
-    for r in range(len(solution_grid)):
-        for c in range(len(solution_grid[0])):
-            if solution_grid[r][c]: # If this cell is part of a word
-                total_letters += 1
-                # Check if user input matches (case insensitive)
-                if (r < len(user_grid) and c < len(user_grid[0]) and 
-                    user_grid[r][c] and 
-                    user_grid[r][c].upper() == solution_grid[r][c].upper()):
-                    correct_letters += 1
-                    score += 10 # 10 points per correct letter
+    result = score_grid(json.loads(game.grid_data), req.user_grid)
     
     # Update game
-    game.score = score
+    game.score = result["score"]
     game.completed = True
     game.status = "completed"
     session.add(game)
     session.commit()
     session.refresh(game)
     
-    return {
-        "score": score,
-        "correct_letters": correct_letters,
-        "total_letters": total_letters,
-        "percentage": int((correct_letters / total_letters) * 100) if total_letters > 0 else 0
-    }
+    return result
+
+@app.post("/api/puzzles/{token}/submit")
+@limiter.limit("10/minute")
+def submit_puzzle(request: Request, token: str, req: SubmitRequest, session: Session = Depends(get_session)):
+    # Score a puzzle issued by /api/generate and record it in a single commit
+    puzzle = claim_puzzle(token)
+    if not puzzle:
+        raise HTTPException(status_code=404, detail="Puzzle not found or already submitted")
+    
+    result = score_grid(puzzle['grid'], req.user_grid)
+    
+    game = Game(
+        grid_data=json.dumps(puzzle['grid']),
+        words_data=json.dumps(puzzle['words']),
+        status="completed",
+        score=result["score"],
+        completed=True
+    )
+    try:
+        session.add(game)
+        session.commit()
+        session.refresh(game)
+    except Exception:
+        # Put the puzzle back so the player can retry the submit
+        with issued_puzzles_lock:
+            issued_puzzles[token] = puzzle
+        raise
+    
+    return {"id": game.id, **result}
 
 @app.post("/api/games/{game_id}/save_name")
 @limiter.limit("5/minute")
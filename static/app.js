@@ -5,7 +5,8 @@ let currentGame = {
     words: [],
     width: 0,
     height: 0,
-    id: null
+    id: null,
+    token: null
 };
 
 let currentFocus = {
@@ -47,7 +48,8 @@ function loadGameData(data) {
         words: data.words,
         width: data.width || 20,
         height: data.height || 20,
-        id: data.id || null
+        id: data.id || null,
+        token: data.token || null
     };
 
     renderGrid();
@@ -283,6 +285,47 @@ document.getElementById('btn-save-score').addEventListener('click', savePlayerNa
 async function submitGame() {
     if (!currentGame) return;
 
+    // Collect user grid
+    const userGrid = [];
+    for (let r = 0; r < currentGame.grid.length; r++) {
+        const row = [];
+        for (let c = 0; c < currentGame.grid[0].length; c++) {
+            const cell = document.querySelector(`.cell[data-row="${r}"][data-col="${c}"] input`);
+            row.push(cell ? cell.value : null);
+        }
+        userGrid.push(row);
+    }
+
+    // Puzzles issued by /api/generate carry a token: the server already has the
+    // solution, so one request scores and records the game.
+    if (currentGame.token && !(currentGame.id > 0)) {
+        try {
+            const response = await fetch(`${API_BASE}/puzzles/${currentGame.token}/submit`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ user_grid: userGrid })
+            });
+
+            if (response.ok) {
+                const result = await response.json();
+                currentGame.id = result.id; // Server ID for saving the player name
+                currentGame.token = null;
+                showScoreModal(result);
+                return;
+            }
+            if (response.status !== 404) {
+                alert('Gagal menilai permainan');
+                return;
+            }
+            // Token expired (e.g. server restart): fall back to saving the puzzle first
+            currentGame.token = null;
+        } catch (e) {
+            console.error(e);
+            alert('Error submitting game');
+            return;
+        }
+    }
+
     // If game hasn't been saved to SERVER yet (or has a local negative ID), save it to server first
     // We need a real server ID to submit scores
     if (!currentGame.id || currentGame.id < 0) {
@@ -307,17 +350,6 @@ async function submitGame() {
         }
     }
 
-    // Collect user grid
-    const userGrid = [];
-    for (let r = 0; r < currentGame.grid.length; r++) {
-        const row = [];
-        for (let c = 0; c < currentGame.grid[0].length; c++) {
-            const cell = document.querySelector(`.cell[data-row="${r}"][data-col="${c}"] input`);
-            row.push(cell ? cell.value : null);
-        }
-        userGrid.push(row);
-    }
-
     try {
         const response = await fetch(`/api/games/${currentGame.id}/submit`, {
             method: 'POST',